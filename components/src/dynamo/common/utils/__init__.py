@@ -10,8 +10,9 @@ Dynamo backends and components.
 Submodules:
     - paths: Workspace directory detection and path utilities
     - prometheus: Prometheus metrics collection and logging utilities
+    - stream_coalescing: Optional coalescing of streamed token chunks
 """
 
-from dynamo.common.utils import paths, prometheus
+from dynamo.common.utils import paths, prometheus, stream_coalescing
 
-__all__ = ["paths", "prometheus"]
+__all__ = ["paths", "prometheus", "stream_coalescing"]
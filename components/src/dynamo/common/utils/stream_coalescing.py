@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""
+Optional coalescing of streamed token chunks.
+
+Backends that stream one chunk per engine step can hold back intermediate
+chunks until DYNAMO_STREAM_COALESCE_N new tokens are pending or
+DYNAMO_STREAM_COALESCE_US microseconds have passed since the previous chunk.
+Both limits are only evaluated when the engine produces its next step; there
+is no timer that flushes a held-back chunk on its own.
+"""
+
+import math
+import os
+import sys
+from dataclasses import dataclass
+from typing import Optional
+
+COALESCE_TOKENS_ENV = "DYNAMO_STREAM_COALESCE_N"
+COALESCE_US_ENV = "DYNAMO_STREAM_COALESCE_US"
+
+
+@dataclass(frozen=True)
+class StreamCoalescing:
+    """
+    Flush limits for a coalesced token stream.
+
+    Attributes:
+        max_tokens: Flush once at least this many new tokens are pending.
+        max_seconds: Flush once this much time has passed since the last flush.
+    """
+
+    max_tokens: int = sys.maxsize
+    max_seconds: float = math.inf
+
+    def should_flush(self, pending_tokens: int, elapsed_seconds: float) -> bool:
+        """
+        Decide whether the pending tokens should be sent now.
+
+        Callers always flush the first and the finishing chunk of a request
+        themselves; this only covers the chunks in between.
+
+        Args:
+            pending_tokens: Number of tokens generated since the last flush.
+            elapsed_seconds: Time since the last flush.
+
+        Returns:
+            True if a chunk should be yielded.
+        """
+        return pending_tokens >= self.max_tokens or elapsed_seconds >= self.max_seconds
+
+
+def stream_coalescing_from_env() -> Optional[StreamCoalescing]:
+    """
+    Read the stream coalescing limits from the environment.
+
+    Returns:
+        The configured limits, or None if coalescing is disabled (the default).
+    """
+    tokens = int(os.getenv(COALESCE_TOKENS_ENV, "0"))
+    micros = int(os.getenv(COALESCE_US_ENV, "0"))
+    if tokens <= 1 and micros <= 0:
+        return None
+    return StreamCoalescing(
+        max_tokens=tokens if tokens > 1 else sys.maxsize,
+        max_seconds=micros / 1e6 if micros > 0 else math.inf,
+    )
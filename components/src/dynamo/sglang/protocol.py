@@ -1,10 +1,9 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-from typing import Any, List, Literal, Optional, Tuple, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, TypedDict, Union
 
 from pydantic import BaseModel, ConfigDict, Field
-from sglang.srt.entrypoints.openai.protocol import ChatCompletionRequest
 
 import dynamo.nixl_connect as connect
 
@@ -60,10 +59,11 @@ class EmbeddingRequest(BaseModel):
     ] = None  # only supported in text-embedding-3 and later models from OpenAI
 
 
-class DisaggPreprocessedRequest(BaseModel):
-    request: Union[PreprocessedRequest, ChatCompletionRequest]
-    sampling_params: dict
-    data_parallel_rank: Optional[int] = None
+# Sent from decode to prefill as a plain dict, without a pydantic round trip
+class DisaggPreprocessedRequest(TypedDict):
+    # PreprocessedRequest or ChatCompletionRequest, as received by decode
+    request: Dict[str, Any]
+    sampling_params: Dict[str, Any]
 
 
 # ============================================================================
@@ -7,7 +7,7 @@ import random
 import socket
 from abc import ABC, abstractmethod
 from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Dict, Optional, Tuple
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
 import sglang as sgl
 from sglang.srt.utils import get_local_ip_auto
@@ -49,6 +49,13 @@ class BaseWorkerHandler(ABC):
         self.prefill_client = prefill_client
         self.serving_mode = config.serving_mode
         self.skip_tokenizer_init = config.server_args.skip_tokenizer_init
+        # skip_tokenizer_init is fixed for the worker's lifetime, so pick the
+        # input builder once instead of branching on every request
+        self._get_input_param = (
+            self._get_token_input_param
+            if self.skip_tokenizer_init
+            else self._get_prompt_input_param
+        )
 
     @abstractmethod
     async def generate(self, request: Dict[str, Any], context: Context):
@@ -67,24 +74,47 @@ class BaseWorkerHandler(ABC):
         """Cleanup resources. Override in subclasses as needed."""
         pass
 
-    def _get_input_param(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Get the appropriate input parameter for SGLang engine.
+    async def _get_token_input_param(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the input parameter for SGLang engine from pre-tokenized input.
 
         Args:
-            request: Request dict with token_ids or messages.
+            request: Request dict with token_ids.
 
         Returns:
-            Dict with either input_ids or prompt for engine.
+            Dict with input_ids for engine.
         """
-        if self.skip_tokenizer_init:
-            return {"input_ids": request["token_ids"]}
-        else:
-            # use sglang's chat templating itself but leave tokenization to the
-            # interal engine's TokenizerManager
-            prompt = self.engine.tokenizer_manager.tokenizer.apply_chat_template(
-                request["messages"], tokenize=False, add_generation_prompt=True
-            )
-            return {"prompt": prompt}
+        return {"input_ids": request["token_ids"]}
+
+    async def _get_prompt_input_param(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the input parameter for SGLang engine from chat messages.
+
+        Args:
+            request: Request dict with messages.
+
+        Returns:
+            Dict with prompt for engine.
+        """
+        # Rendering the Jinja chat template is pure Python and can take
+        # milliseconds for long conversations, so keep it off the event loop
+        prompt = await asyncio.get_running_loop().run_in_executor(
+            None, self._apply_chat_template, request["messages"]
+        )
+        return {"prompt": prompt}
+
+    def _apply_chat_template(self, messages: List[Dict[str, Any]]) -> str:
+        """Render chat messages into a prompt string.
+
+        Args:
+            messages: OpenAI-style chat messages.
+
+        Returns:
+            Prompt string for the engine.
+        """
+        # use sglang's chat templating itself but leave tokenization to the
+        # interal engine's TokenizerManager
+        return self.engine.tokenizer_manager.tokenizer.apply_chat_template(
+            messages, tokenize=False, add_generation_prompt=True
+        )
 
     @staticmethod
     def _generate_bootstrap_room() -> int:
@@ -93,7 +123,7 @@ class BaseWorkerHandler(ABC):
         Returns:
             Random 63-bit integer.
         """
-        return random.randint(0, 2**63 - 1)
+        return random.getrandbits(63)
 
     @staticmethod
     def _get_bootstrap_info(engine: sgl.Engine) -> Tuple[str, int]:
@@ -117,30 +147,26 @@ class BaseWorkerHandler(ABC):
 
         return bootstrap_host, bootstrap_port
 
-    async def _handle_cancellation(
-        self, request_id_future: asyncio.Future, context: Context
-    ):
+    async def _handle_cancellation(self, sglang_request_id: str, context: Context):
         """Background task to handle cancellation by monitoring context state.
 
         Args:
-            request_id_future: Future that will be set with the SGLang request ID
-                              when the first response arrives.
+            sglang_request_id: SGLang request ID taken from the first response.
             context: Context object for cancellation handling.
         """
+        # Resolve the context ID once; debug lines below format lazily
+        context_id = context.id()
         try:
-            logging.debug(f"Cancellation monitor started for Context: {context.id()}")
-
-            # Always wait for the request ID to ensure we can abort the request
-            sglang_request_id = await request_id_future
             logging.debug(
-                f"Cancellation monitor received SGLang Request ID {sglang_request_id} for Context: {context.id()}"
+                "Cancellation monitor started for SGLang Request ID %s, Context: %s",
+                sglang_request_id,
+                context_id,
             )
-            logging.debug(f"Request ID future cancelled for Context: {context.id()}")
 
             await context.async_killed_or_stopped()
 
             logging.info(
-                f"Cancellation signal received for SGLang Request ID {sglang_request_id}, Context: {context.id()}"
+                f"Cancellation signal received for SGLang Request ID {sglang_request_id}, Context: {context_id}"
             )
 
             # Call abort_request on the tokenizer_manager through the engine
@@ -154,27 +180,23 @@ class BaseWorkerHandler(ABC):
                 self.engine.tokenizer_manager.abort_request(
                     rid=sglang_request_id, abort_all=False
                 )
-                logging.info(f"Aborted Request ID: {context.id()}")
+                logging.info(f"Aborted Request ID: {context_id}")
             else:
                 logging.error(
-                    f"SGLang tokenizer_manager not found for abort request: {context.id()}"
+                    f"SGLang tokenizer_manager not found for abort request: {context_id}"
                 )
         except asyncio.CancelledError:
             # Task was cancelled, which is expected when generation completes
-            request_id = "unknown"
-            if request_id_future.done() and not request_id_future.cancelled():
-                try:
-                    request_id = request_id_future.result()
-                except Exception:
-                    pass
             logging.debug(
-                f"Cancellation monitor task cancelled for SGLang Request ID {request_id}, Context: {context.id()}"
+                "Cancellation monitor task cancelled for SGLang Request ID %s, Context: %s",
+                sglang_request_id,
+                context_id,
             )
             raise
 
     @asynccontextmanager
     async def _cancellation_monitor(
-        self, request_id_future: asyncio.Future, context: Context
+        self, sglang_request_id: str, context: Context
     ) -> AsyncGenerator[asyncio.Task, None]:
         """
         Context manager for monitoring request cancellation.
@@ -182,34 +204,29 @@ class BaseWorkerHandler(ABC):
         cleans it up when the context exits.
 
         Args:
-            request_id_future: Future that will be set with the SGLang request ID
-                              when the first response arrives.
+            sglang_request_id: SGLang request ID taken from the first response.
             context: Context object for cancellation handling
 
         Yields:
             asyncio.Task: The cancellation monitoring task being managed
         """
-        logging.debug(f"Creating cancellation monitor task for Context: {context.id()}")
+        context_id = context.id()
+        logging.debug("Creating cancellation monitor task for Context: %s", context_id)
 
         # Start the cancellation monitoring task
         cancellation_task = asyncio.create_task(
-            self._handle_cancellation(request_id_future, context)
+            self._handle_cancellation(sglang_request_id, context)
         )
 
         try:
             yield cancellation_task
         finally:
             # Clean up the background cancellation task
-            request_id = "unknown"
-            if request_id_future.done() and not request_id_future.cancelled():
-                try:
-                    request_id = request_id_future.result()
-                except Exception:
-                    pass
-
             if not cancellation_task.done():
                 logging.debug(
-                    f"Cancelling cancellation monitor task for SGLang Request ID {request_id}, Context: {context.id()}"
+                    "Cancelling cancellation monitor task for SGLang Request ID %s, Context: %s",
+                    sglang_request_id,
+                    context_id,
                 )
                 cancellation_task.cancel()
                 try:
@@ -218,5 +235,7 @@ class BaseWorkerHandler(ABC):
                     pass
             else:
                 logging.debug(
-                    f"Cancellation monitor task already completed for SGLang Request ID {request_id}, Context: {context.id()}"
+                    "Cancellation monitor task already completed for SGLang Request ID %s, Context: %s",
+                    sglang_request_id,
+                    context_id,
                 )
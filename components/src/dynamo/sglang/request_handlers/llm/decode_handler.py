@@ -1,7 +1,6 @@
 # SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
 # SPDX-License-Identifier: Apache-2.0
 
-import asyncio
 import logging
 import time
 from typing import Any, AsyncGenerator, Dict, Optional
@@ -9,6 +8,7 @@ from typing import Any, AsyncGenerator, Dict, Optional
 import sglang as sgl
 
 from dynamo._core import Client, Component, Context
+from dynamo.common.utils.stream_coalescing import stream_coalescing_from_env
 from dynamo.sglang.args import Config, DisaggregationMode
 from dynamo.sglang.protocol import DisaggPreprocessedRequest
 from dynamo.sglang.publisher import DynamoSglangPublisher
@@ -52,11 +52,25 @@ class DecodeWorkerHandler(BaseWorkerHandler):
                 raise ValueError(
                     "prefill_client must be provided when serving_mode is decode"
                 )
-            self.prefill_client = prefill_client
-            logging.info("Decode worker handler initialized")
 
         self.prefill_router_client = prefill_router_client
-        logging.info("Worker handler initialized")
+        # Request and response formats follow skip_tokenizer_init, which is
+        # fixed for the worker's lifetime
+        self._build_sampling_params = (
+            self._build_token_sampling_params
+            if self.skip_tokenizer_init
+            else self._build_openai_sampling_params
+        )
+        self._process_stream = (
+            self._process_token_stream
+            if self.skip_tokenizer_init
+            else self._process_text_stream
+        )
+        # Optional coalescing of token-stream chunks, None when disabled.
+        self._coalescing = stream_coalescing_from_env()
+        logging.info(
+            f"Decode worker handler initialized (mode={self.serving_mode.value})"
+        )
 
     def cleanup(self) -> None:
         """Shutdown the engine and cleanup resources."""
@@ -64,37 +78,54 @@ class DecodeWorkerHandler(BaseWorkerHandler):
         logging.info("Engine shutdown")
         super().cleanup()
 
-    def _build_sampling_params(self, request: Dict[str, Any]) -> Dict[str, Any]:
-        """Build sampling params from request format.
+    @staticmethod
+    def _build_token_sampling_params(request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build sampling params from a token-based request.
 
         Args:
-            request: Request dict in either token-based or OpenAI format.
+            request: Request dict with sampling_options and stop_conditions.
 
         Returns:
             Dict of sampling parameters for SGLang engine.
         """
-        if self.skip_tokenizer_init:
-            # Token-based request format
-            sampling_opts = request.get("sampling_options", {})
-            stop_conditions = request.get("stop_conditions", {})
-
-            param_mapping = {
-                "temperature": sampling_opts.get("temperature"),
-                "top_p": sampling_opts.get("top_p"),
-                "top_k": sampling_opts.get("top_k"),
-                "max_new_tokens": stop_conditions.get("max_tokens"),
-                "ignore_eos": stop_conditions.get("ignore_eos"),
-            }
-        else:
-            # OpenAI request format
-            param_mapping = {
-                "temperature": request.get("temperature"),
-                "top_p": request.get("top_p"),
-                "top_k": request.get("top_k"),
-                "max_new_tokens": request.get("max_tokens"),
-            }
+        sampling_opts = request.get("sampling_options", {})
+        stop_conditions = request.get("stop_conditions", {})
+
+        # Insert only the values that are set, rather than building a full
+        # mapping and filtering out the Nones afterwards
+        params: Dict[str, Any] = {}
+        if (temperature := sampling_opts.get("temperature")) is not None:
+            params["temperature"] = temperature
+        if (top_p := sampling_opts.get("top_p")) is not None:
+            params["top_p"] = top_p
+        if (top_k := sampling_opts.get("top_k")) is not None:
+            params["top_k"] = top_k
+        if (max_tokens := stop_conditions.get("max_tokens")) is not None:
+            params["max_new_tokens"] = max_tokens
+        if (ignore_eos := stop_conditions.get("ignore_eos")) is not None:
+            params["ignore_eos"] = ignore_eos
+        return params
+
+    @staticmethod
+    def _build_openai_sampling_params(request: Dict[str, Any]) -> Dict[str, Any]:
+        """Build sampling params from an OpenAI-format request.
 
-        return {k: v for k, v in param_mapping.items() if v is not None}
+        Args:
+            request: OpenAI chat completion request dict.
+
+        Returns:
+            Dict of sampling parameters for SGLang engine.
+        """
+        params: Dict[str, Any] = {}
+        if (temperature := request.get("temperature")) is not None:
+            params["temperature"] = temperature
+        if (top_p := request.get("top_p")) is not None:
+            params["top_p"] = top_p
+        if (top_k := request.get("top_k")) is not None:
+            params["top_k"] = top_k
+        if (max_tokens := request.get("max_tokens")) is not None:
+            params["max_new_tokens"] = max_tokens
+        return params
 
     async def generate(
         self, request: Dict[str, Any], context: Context
@@ -113,9 +144,14 @@ class DecodeWorkerHandler(BaseWorkerHandler):
         """
         logging.debug(f"New Request ID: {context.id()}")
         sampling_params = self._build_sampling_params(request)
-        input_param = self._get_input_param(request)
+        input_param = await self._get_input_param(request)
 
         if self.serving_mode == DisaggregationMode.DECODE:
+            prefill_request = DisaggPreprocessedRequest(
+                request=request,
+                sampling_params=sampling_params,
+            )
+
             # request the bootstrap info from the target prefill worker
             if (
                 self.prefill_router_client is not None
@@ -131,18 +167,12 @@ class DecodeWorkerHandler(BaseWorkerHandler):
                 logging.info(f"Best prefill worker ID: {worker_id}, overlap: {overlap}")
 
                 prefill_stream = await self.prefill_client.direct(
-                    DisaggPreprocessedRequest(
-                        request=request,
-                        sampling_params=sampling_params,
-                    ).model_dump(),
+                    prefill_request,
                     worker_id,
                 )
             else:
                 prefill_stream = await self.prefill_client.generate(
-                    DisaggPreprocessedRequest(
-                        request=request,
-                        sampling_params=sampling_params,
-                    ).model_dump(),
+                    prefill_request,
                     context=context,
                 )
 
@@ -163,24 +193,16 @@ class DecodeWorkerHandler(BaseWorkerHandler):
                 bootstrap_room=bootstrap_info["bootstrap_room"],
             )
 
-            if self.skip_tokenizer_init:
-                async for out in self._process_token_stream(decode, context):
-                    yield out
-            else:
-                async for out in self._process_text_stream(decode, context):
-                    yield out
+            async for out in self._process_stream(decode, context):
+                yield out
         else:
             agg = await self.engine.async_generate(
                 **input_param,
                 sampling_params=sampling_params,
                 stream=True,
             )
-            if self.skip_tokenizer_init:
-                async for out in self._process_token_stream(agg, context):
-                    yield out
-            else:
-                async for out in self._process_text_stream(agg, context):
-                    yield out
+            async for out in self._process_stream(agg, context):
+                yield out
 
     async def _process_token_stream(
         self,
@@ -196,24 +218,23 @@ class DecodeWorkerHandler(BaseWorkerHandler):
         Yields:
             Dict with token_ids and optional finish_reason.
         """
-        num_output_tokens_so_far = 0
+        # The first response carries the SGLang request ID, so the cancellation
+        # monitor is started once here instead of being checked on every token.
+        res = await anext(stream_source, None)
+        if res is None:
+            return
+        sglang_request_id = res["meta_info"]["id"]
+        logging.debug(f"New SGLang Request ID: {sglang_request_id}")
+
+        coalescing = self._coalescing
+        last_flush = time.monotonic()
 
-        # Use Future pattern for request ID - will be set when first response arrives
-        request_id_future = asyncio.Future()
-        async with self._cancellation_monitor(request_id_future, context):
-            async for res in stream_source:
-                # Extract SGLang request ID from the first response and set the future
-                if not request_id_future.done():
-                    meta_info = res.get("meta_info", {})
-                    sglang_request_id = meta_info.get("id")
-                    if sglang_request_id:
-                        request_id_future.set_result(sglang_request_id)
-                        logging.debug(f"New SGLang Request ID: {sglang_request_id}")
-
-                # Check cancellation before yielding to allow proper cleanup.
-                # This lets SGLang proceed to the second token generation, which will
-                # async context switch and allow the abort monitor to signal cancellation.
-                # The loop should exit by itself when context.is_stopped() returns True.
+        num_output_tokens_so_far = 0
+        async with self._cancellation_monitor(sglang_request_id, context):
+            while True:
+                # Note: No explicit cancellation checks needed here.
+                # When abort_request is called by the cancellation monitor,
+                # SGLang will terminate this async generator automatically.
                 out = {}
                 finish_reason = res["meta_info"]["finish_reason"]
                 if finish_reason:
@@ -222,16 +243,39 @@ class DecodeWorkerHandler(BaseWorkerHandler):
                 output_ids = res.get("output_ids", [])
                 # If request is not finished yet, but there are no outputs, return an error.
                 if not output_ids and not finish_reason:
+                    # A stopped or aborted request also ends this way and must
+                    # not be reported as an error.
                     if not context.is_stopped():
                         yield {"finish_reason": "error", "token_ids": []}
                     break
 
                 next_total_toks = len(output_ids)
-                out["token_ids"] = output_ids[num_output_tokens_so_far:]
-                num_output_tokens_so_far = next_total_toks
-                if not context.is_stopped():
+                flush = True
+                if (
+                    coalescing is not None
+                    and num_output_tokens_so_far
+                    and not finish_reason
+                ):
+                    # output_ids is cumulative, so held-back tokens are picked
+                    # up by the next chunk that is yielded. The first chunk is
+                    # always sent right away to keep TTFT unchanged.
+                    now = time.monotonic()
+                    flush = coalescing.should_flush(
+                        next_total_toks - num_output_tokens_so_far, now - last_flush
+                    )
+                    if flush:
+                        last_flush = now
+
+                if flush:
+                    out["token_ids"] = output_ids[num_output_tokens_so_far:]
+                    num_output_tokens_so_far = next_total_toks
                     yield out
 
+                try:
+                    res = await anext(stream_source)
+                except StopAsyncIteration:
+                    break
+
     async def _process_text_stream(
         self,
         stream_source: AsyncGenerator[Dict[str, Any], None],
@@ -246,25 +290,24 @@ class DecodeWorkerHandler(BaseWorkerHandler):
         Yields:
             OpenAI-formatted chat completion chunk dicts.
         """
+        # The first response carries the SGLang request ID, so the cancellation
+        # monitor is started once here instead of being checked on every chunk.
+        res = await anext(stream_source, None)
+        if res is None:
+            return
+        sglang_request_id = res["meta_info"]["id"]
+        logging.debug(f"New SGLang Request ID: {sglang_request_id}")
+
+        # OpenAI allows a single timestamp per stream, so resolve it and the
+        # model name once instead of per chunk
+        created = int(time.time())
+        model_name = self.config.server_args.served_model_name
         count = 0
-
-        # Use Future pattern for request ID - will be set when first response arrives
-        request_id_future = asyncio.Future()
-        async with self._cancellation_monitor(request_id_future, context):
-            async for res in stream_source:
-                # Extract SGLang request ID from the first response and set the future
-                if not request_id_future.done():
-                    meta_info = res.get("meta_info", {})
-                    sglang_request_id = meta_info.get("id")
-                    if sglang_request_id:
-                        request_id_future.set_result(sglang_request_id)
-                        logging.debug(f"New SGLang Request ID: {sglang_request_id}")
-
-                # Check cancellation before yielding to allow proper cleanup.
-                # This lets SGLang proceed to the second token generation, which will
-                # async context switch and allow the abort monitor to signal cancellation.
-                # The loop should exit by itself when context.is_stopped() returns True.
-
+        async with self._cancellation_monitor(sglang_request_id, context):
+            while True:
+                # Note: No explicit cancellation checks needed here.
+                # When abort_request is called by the cancellation monitor,
+                # SGLang will terminate this async generator automatically.
                 index = res.get("index", 0)
                 text = res.get("text", "")
 
@@ -280,12 +323,16 @@ class DecodeWorkerHandler(BaseWorkerHandler):
                 }
 
                 response = {
-                    "id": res["meta_info"]["id"],
-                    "created": int(time.time()),
+                    "id": sglang_request_id,
+                    "created": created,
                     "choices": [choice_data],
-                    "model": self.config.server_args.served_model_name,
+                    "model": model_name,
                     "object": "chat.completion.chunk",
                 }
-                if not context.is_stopped():
-                    yield response
+                yield response
                 count = next_count
+
+                try:
+                    res = await anext(stream_source)
+                except StopAsyncIteration:
+                    break
@@ -33,6 +33,13 @@ class PrefillWorkerHandler(BaseWorkerHandler):
         """
         self.engine = engine
         self.bootstrap_host, self.bootstrap_port = self._get_bootstrap_info(self.engine)
+        # Host and port are fixed for the worker's lifetime; only the room
+        # changes per request
+        self._bootstrap_info_template = {
+            "bootstrap_host": self.bootstrap_host,
+            "bootstrap_port": self.bootstrap_port,
+            "bootstrap_room": 0,
+        }
         super().__init__(component, engine, config, publisher)
         self._consume_tasks = set()
         logging.info(
@@ -66,15 +73,12 @@ class PrefillWorkerHandler(BaseWorkerHandler):
         logging.debug(f"New Request ID: {context.id()}")
         bootstrap_room = self._generate_bootstrap_room()
 
-        bootstrap_info = {
-            "bootstrap_host": self.bootstrap_host,
-            "bootstrap_port": self.bootstrap_port,
-            "bootstrap_room": bootstrap_room,
-        }
+        bootstrap_info = self._bootstrap_info_template.copy()
+        bootstrap_info["bootstrap_room"] = bootstrap_room
 
         yield bootstrap_info
 
-        input_param = self._get_input_param(request["request"])
+        input_param = await self._get_input_param(request["request"])
 
         results = await self.engine.async_generate(
             **input_param,
@@ -98,18 +102,16 @@ class PrefillWorkerHandler(BaseWorkerHandler):
             results: Async generator from engine.async_generate.
             context: Context object for cancellation handling.
         """
-        # Use Future pattern for request ID - will be set when first response arrives
-        request_id_future = asyncio.Future()
-        async with self._cancellation_monitor(request_id_future, context):
-            async for res in results:
-                # Extract SGLang request ID from the first response and set the future
-                if not request_id_future.done():
-                    meta_info = res.get("meta_info", {})
-                    sglang_request_id = meta_info.get("id")
-                    if sglang_request_id:
-                        request_id_future.set_result(sglang_request_id)
-                        logging.debug(f"New Prefill Request ID: {sglang_request_id}")
-
-                # Note: No explicit cancellation checks needed here.
-                # When abort_request is called by the cancellation monitor,
-                # SGLang will terminate this async generator automatically.
+        # The first response carries the SGLang request ID needed for abort
+        res = await anext(results, None)
+        if res is None:
+            return
+        sglang_request_id = res["meta_info"]["id"]
+        logging.debug(f"New Prefill Request ID: {sglang_request_id}")
+
+        async with self._cancellation_monitor(sglang_request_id, context):
+            # Note: No explicit cancellation checks needed here.
+            # When abort_request is called by the cancellation monitor,
+            # SGLang will terminate this async generator automatically.
+            async for _ in results:
+                pass
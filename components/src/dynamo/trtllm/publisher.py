@@ -34,6 +34,23 @@ def _to_signed_i64(value: int | None) -> int | None:
     return value
 
 
+class ErrorQueue(Queue):
+    """
+    A queue collecting errors from the publisher threads.
+
+    `has_error` is a plain attribute that is set once anything has been put on the
+    queue, so readers on the request path can check it without taking the queue lock.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.has_error = False
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self.has_error = True
+
+
 class ManagedThread(threading.Thread):
     """
     A thread that runs a task and handles errors.
@@ -135,7 +152,7 @@ class Publisher:
         # A set to store the block hash of partial block (i.e. block containing less than kv_block_size tokens) hashes.
         # It is used to prevent sending remove event to kv router since partial blocks are not stored.
         self.partial_block_hashes = set()
-        self.error_queue: Queue = Queue()
+        self.error_queue: ErrorQueue = ErrorQueue()
         self._stop_event = threading.Event()
 
     async def _create_metrics_publisher_endpoint(self):
@@ -388,6 +405,9 @@ class Publisher:
             logging.debug("Started stats thread")
 
     def check_error_queue(self):
+        # Skip the locked queue access until a publisher thread has reported an error.
+        if not self.error_queue.has_error:
+            return None
         if not self.error_queue.empty():
             logging.error("Error in publishers error queue")
             return self.error_queue.get()
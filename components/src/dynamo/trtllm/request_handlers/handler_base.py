@@ -14,13 +14,13 @@
 # limitations under the License.
 
 import asyncio
-import copy
 import logging
 import os
+import time
 from contextlib import asynccontextmanager
-from dataclasses import asdict, dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
-from typing import Any, AsyncGenerator, Optional, Union
+from typing import Any, AsyncGenerator, Callable, Optional, Tuple, Union
 
 import torch
 from tensorrt_llm.executor.result import GenerationResult
@@ -29,6 +29,7 @@ from tensorrt_llm.llmapi import DisaggregatedParams as LlmDisaggregatedParams
 from tensorrt_llm.llmapi.llm import SamplingParams
 
 from dynamo._core import Context
+from dynamo.common.utils.stream_coalescing import stream_coalescing_from_env
 from dynamo.logits_processing.examples import HelloWorldLogitsProcessor
 from dynamo.nixl_connect import Connector
 from dynamo.runtime import DistributedRuntime
@@ -57,7 +58,7 @@ class DisaggregationStrategy(Enum):
     DECODE_FIRST = "decode_first"
 
 
-@dataclass
+@dataclass(slots=True)
 class RequestHandlerConfig:
     """
     Configuration for the request handler
@@ -82,11 +83,105 @@ class RequestHandlerConfig:
     metrics_collector: Optional[Any] = None  # TensorRT-LLM MetricsCollector
 
 
+@dataclass(slots=True)
+class StopConditions:
+    """
+    Stop conditions of a preprocessed request
+    """
+
+    max_tokens: Optional[int] = None
+    min_tokens: Optional[int] = None
+    ignore_eos: Optional[bool] = None
+
+
+@dataclass(slots=True)
+class DecodedRequest:
+    """
+    Typed view of the preprocessed request fields read by the handler.
+
+    The request dict is decoded once on entry so that the rest of the request
+    path works with attribute access instead of repeated nested dict lookups.
+    """
+
+    token_ids: Optional[list]
+    sampling_options: dict
+    stop_conditions: StopConditions
+    disaggregated_params: Optional[dict]
+    request_id: str
+    model: str
+
+    @classmethod
+    def from_dict(cls, request: dict) -> "DecodedRequest":
+        stop_conditions = request["stop_conditions"]
+        return cls(
+            token_ids=request.get("token_ids"),
+            sampling_options=request["sampling_options"],
+            stop_conditions=StopConditions(
+                max_tokens=stop_conditions.get("max_tokens"),
+                min_tokens=stop_conditions.get("min_tokens"),
+                ignore_eos=stop_conditions.get("ignore_eos"),
+            ),
+            disaggregated_params=request.get("disaggregated_params"),
+            request_id=request.get("id") or request.get("request_id", "unknown-id"),
+            model=request.get("model", "unknown_model"),
+        )
+
+
+# Sampling options that can be forwarded to the SamplingParams constructor.
+_SAMPLING_PARAMS_KEYS = frozenset(f.name for f in fields(SamplingParams) if f.init)
+# Internal SamplingParams state outside the constructor, e.g. what
+# SamplingParams._setup() derives from the tokenizer at startup.
+_SAMPLING_PARAMS_STATE_KEYS = tuple(
+    f.name for f in fields(SamplingParams) if not f.init
+)
+
+
+def _freeze(value: Any) -> Any:
+    """
+    Convert lists, including nested lists, to tuples so they can be shared
+    between requests. Other values such as dicts and objects are returned as-is
+    and stay shared; the handler never mutates them.
+    """
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
 class HandlerBase:
     """
     Base class for request handlers.
     """
 
+    # Handlers are long-lived and their attributes are read on every streamed
+    # chunk, so keep them in slots rather than an instance __dict__.
+    __slots__ = (
+        "engine",
+        "component",
+        "default_sampling_params",
+        "publisher",
+        "metrics_collector",
+        "disaggregation_mode",
+        "disaggregation_strategy",
+        "next_client",
+        "next_router_client",
+        "encode_client",
+        "multimodal_processor",
+        "first_generation",
+        "connector",
+        "runtime",
+        "_is_prefill",
+        "_is_decode",
+        "_default_sp_fields",
+        "_default_sp_state",
+        "_test_logits_tokenizer",
+        "_coalescing",
+        "generate_locally",
+    )
+
+    # Bound in __init__ to the generation path specialized for the handler's
+    # disaggregation mode.
+    generate_locally: Callable[..., AsyncGenerator[dict, None]]
+
     def __init__(self, config: RequestHandlerConfig):
         self.engine = config.engine
         self.component = config.component
@@ -94,6 +189,13 @@ class HandlerBase:
         self.publisher = config.publisher
         self.metrics_collector = config.metrics_collector
         self.disaggregation_mode = config.disaggregation_mode
+        # The mode is fixed for the lifetime of the handler, so resolve the
+        # checks used on the request path once.
+        self._is_prefill = self.disaggregation_mode == DisaggregationMode.PREFILL
+        self._is_decode = self.disaggregation_mode == DisaggregationMode.DECODE
+        self.generate_locally = (
+            self._generate_prefill if self._is_prefill else self._generate_decode
+        )
         self.disaggregation_strategy = config.disaggregation_strategy
         self.next_client = config.next_client
         self.next_router_client = config.next_router_client
@@ -103,12 +205,35 @@ class HandlerBase:
         self.connector = config.connector
         # Store runtime reference for graceful shutdown
         self.runtime = config.runtime
+        # Snapshot the constructor arguments of the default sampling params so that
+        # every request can build a fresh SamplingParams instead of deep copying it.
+        # Lists are frozen to tuples so they can be shared across requests.
+        self._default_sp_fields = {
+            name: _freeze(getattr(config.default_sampling_params, name))
+            for name in _SAMPLING_PARAMS_KEYS
+        }
+        # TRT-LLM skips _setup() for params whose end_id is already set, so state
+        # it derived at startup has to be carried over to every request as well.
+        self._default_sp_state = {
+            name: _freeze(getattr(config.default_sampling_params, name))
+            for name in _SAMPLING_PARAMS_STATE_KEYS
+        }
+        # Optional test-only logits processing (enable with DYNAMO_ENABLE_TEST_LOGITS_PROCESSOR=1).
+        # The tokenizer is resolved once here; the processor itself keeps per-request
+        # decoding state, so a fresh instance is still created for every request.
+        self._test_logits_tokenizer = (
+            self.engine.llm.tokenizer
+            if os.getenv("DYNAMO_ENABLE_TEST_LOGITS_PROCESSOR") == "1"
+            else None
+        )
+        # Optional coalescing of streamed chunks, None when disabled.
+        self._coalescing = stream_coalescing_from_env()
 
     def check_error(self, result: dict):
         """
         Check if there is an error in the result.
         """
-        if self.disaggregation_mode == DisaggregationMode.PREFILL:
+        if self._is_prefill:
             return result["finish_reason"] == "error"
         else:
             return (
@@ -175,130 +300,284 @@ class HandlerBase:
             logging.critical("Forcing process exit for restart")
             os._exit(1)
 
-    async def generate_locally(
+    async def _prepare_generation(
         self,
         request: dict,
-        context: Context,
         embeddings: Optional[Union[torch.Tensor, dict]] = None,
-    ):
+    ) -> Tuple[DecodedRequest, Any, SamplingParams, Optional[LlmDisaggregatedParams]]:
         """
-        Generate responses based on the disaggregation mode in the request.
+        Decode the request and build the inputs for the engine.
 
         Args:
             request: The request dictionary containing generation parameters
-            context: Context object for cancellation handling
             embeddings: Optional tensor or dict containing embeddings for multimodal processing
+
+        Returns:
+            The decoded request, the engine inputs, the sampling params and the
+            disaggregated params to pass to the engine.
         """
-        logging.debug(f"Request: {request}")
+        # Lazy formatting: the request dict is only rendered when DEBUG is enabled.
+        logging.debug("Request: %s", request)
 
-        # Default to text-based input. This will be overwritten if multimodal
-        # content is found and processed.
-        processed_input = None
+        multimodal_processor = self.multimodal_processor
+        publisher = self.publisher
+        is_prefill = self._is_prefill
 
-        # Check for multimodal request and process it
-        if self.multimodal_processor:
-            processed_input = await self.multimodal_processor.process_openai_request(
+        if multimodal_processor is None:
+            # text-only flow
+            req = DecodedRequest.from_dict(request)
+            processed_input = req.token_ids
+        else:
+            # The multimodal processor normalizes OpenAI-format requests in place,
+            # so the request can only be decoded once it has been processed.
+            processed_input = await multimodal_processor.process_openai_request(
                 request, embeddings
             )
-
-        else:
-            # text-only flow
-            processed_input = request.get("token_ids")
+            req = DecodedRequest.from_dict(request)
 
         # Check if there is an error in the publisher error queue
-        publishers_error = (
-            self.publisher.check_error_queue() if self.publisher else None
-        )
+        publishers_error = publisher.check_error_queue() if publisher else None
         if publishers_error:
             raise publishers_error
 
         # Decode the disaggregated params from the request
         disaggregated_params = None
 
-        if self.disaggregation_mode == DisaggregationMode.PREFILL:
-            request["stop_conditions"]["max_tokens"] = 1
+        if is_prefill:
+            req.stop_conditions.max_tokens = 1
             disaggregated_params = LlmDisaggregatedParams(request_type="context_only")
 
-        if "disaggregated_params" in request:
-            if self.disaggregation_mode == DisaggregationMode.PREFILL:
+        if req.disaggregated_params is not None:
+            if is_prefill:
                 raise ValueError("Cannot provide disaggregated_params in prefill mode")
             disaggregated_params = DisaggregatedParamsCodec.decode(
-                DisaggregatedParams(**request["disaggregated_params"])
+                DisaggregatedParams(**req.disaggregated_params)
             )
             disaggregated_params.request_type = "generation_only"
 
-        if (
-            self.disaggregation_mode == DisaggregationMode.DECODE
-            and disaggregated_params is None
-        ):
+        if self._is_decode and disaggregated_params is None:
             raise ValueError("Disaggregated params are required for decode mode")
 
-        num_output_tokens_so_far = 0
+        overrides = {
+            key: value
+            for key, value in req.sampling_options.items()
+            if value and key in _SAMPLING_PARAMS_KEYS
+        }
+
+        stop_conditions = req.stop_conditions
+        if stop_conditions.max_tokens:
+            overrides["max_tokens"] = stop_conditions.max_tokens
 
-        sampling_params = copy.deepcopy(self.default_sampling_params)
+        if stop_conditions.ignore_eos:
+            overrides["ignore_eos"] = stop_conditions.ignore_eos
 
-        for key, value in request["sampling_options"].items():
-            if not value:
-                continue
-            if hasattr(sampling_params, key):
-                setattr(sampling_params, key, value)
+        if stop_conditions.min_tokens:
+            overrides["min_tokens"] = stop_conditions.min_tokens
 
-        max_tokens = request["stop_conditions"]["max_tokens"]
-        if max_tokens:
-            sampling_params.max_tokens = max_tokens
+        sampling_params = SamplingParams(**{**self._default_sp_fields, **overrides})
+        for name, value in self._default_sp_state.items():
+            setattr(sampling_params, name, value)
+
+        if self._test_logits_tokenizer is not None:
+            sampling_params.logits_processor = create_trtllm_adapters(
+                [HelloWorldLogitsProcessor(self._test_logits_tokenizer)]
+            )
 
-        ignore_eos = request["stop_conditions"].get("ignore_eos")
-        if ignore_eos:
-            sampling_params.ignore_eos = ignore_eos
+        return req, processed_input, sampling_params, disaggregated_params
 
-        min_tokens = request["stop_conditions"].get("min_tokens")
-        if min_tokens:
-            sampling_params.min_tokens = min_tokens
+    async def _handle_generation_error(self, error: Exception, request_id: str):
+        """
+        Yield the error response for a failed generation.
 
-        # TODO: Instead of True, we should use streaming from the request.
-        # However, currently dynamo run does not send streaming in the request.
-        streaming = (
-            False if self.disaggregation_mode == DisaggregationMode.PREFILL else True
+        Per-request errors are only reported to the client, any other error
+        also triggers a graceful shutdown of the worker.
+        """
+        # 1. Per-request errors - send to client, don't shutdown
+        if isinstance(error, RequestError):
+            logging.warning(f"Request {request_id} error: {error}")
+            yield {"finish_reason": "error", "token_ids": []}
+            return
+
+        # 2. ALL OTHER ERRORS - graceful shutdown
+        error_type = type(error).__name__
+        error_msg = str(error)
+        logging.error(
+            f"Fatal {error_type} in request {request_id}: {error_msg}",
+            exc_info=error,
         )
 
-        request_id = request.get("id") or request.get("request_id", "unknown-id")
-        model_name = request.get("model", "unknown_model")
+        # Try to send error to client before shutdown
+        try:
+            yield {
+                "finish_reason": "error",
+                "token_ids": [],
+            }
+        except Exception:
+            pass  # Best effort
+
+        # Initiate graceful shutdown
+        await self._initiate_shutdown(error)
+
+    def _log_metrics(self, res: GenerationResult):
+        """
+        Log metrics to TensorRT-LLM MetricsCollector when a request finishes.
+        """
+        if self.metrics_collector and hasattr(res, "metrics_dict"):
+            try:
+                self.metrics_collector.log_metrics_dict(res.metrics_dict)
+            except Exception as e:
+                logging.warning(f"Failed to log TensorRT-LLM metrics: {e}")
+
+    async def _generate_prefill(
+        self,
+        request: dict,
+        context: Context,
+        embeddings: Optional[Union[torch.Tensor, dict]] = None,
+    ):
+        """
+        Run the context phase of a request and return the disaggregated params.
+
+        Prefill is limited to a single, non-streamed generation step, so this
+        path never emits a stop chunk.
 
-        # Optional test-only logits processing (enable with DYNAMO_ENABLE_TEST_LOGITS_PROCESSOR=1)
-        if os.getenv("DYNAMO_ENABLE_TEST_LOGITS_PROCESSOR") == "1":
-            processors = [HelloWorldLogitsProcessor(self.engine.llm.tokenizer)]
-            adapters = create_trtllm_adapters(processors)
-            sampling_params.logits_processor = adapters
+        Args:
+            request: The request dictionary containing generation parameters
+            context: Context object for cancellation handling
+            embeddings: Optional tensor or dict containing embeddings for multimodal processing
+        """
+        (
+            req,
+            processed_input,
+            sampling_params,
+            disaggregated_params,
+        ) = await self._prepare_generation(request, embeddings)
+        request_id = req.request_id
+        model_name = req.model
+
+        multimodal_processor = self.multimodal_processor
+        publisher = self.publisher
 
         try:
-            # NEW: Updated engine call to include multimodal data
             generation_result = self.engine.llm.generate_async(
-                inputs=processed_input,  # Use the correctly extracted inputs
+                inputs=processed_input,
                 sampling_params=sampling_params,
                 disaggregated_params=disaggregated_params,
-                streaming=streaming,
+                streaming=False,
             )
 
+            # TRTLLM engine needs to start generating tokens first before stats
+            # can be retrieved, so the publisher is started on the first result.
+            start_publisher = publisher is not None and self.first_generation
+
             # Use the context manager to handle cancellation monitoring
             async with self._cancellation_monitor(generation_result, context):
                 async for res in generation_result:
-                    # TRTLLM engine needs to start generating tokens first before stats
-                    # can be retrieved.
-                    if self.first_generation and self.publisher:
-                        self.publisher.start()
+                    if start_publisher:
+                        publisher.start()
                         self.first_generation = False
+                        start_publisher = False
+
+                    # If we are not done generating, but there are no outputs, return an error
+                    if not res.outputs and not res.finished:
+                        yield {"finish_reason": "error", "token_ids": []}
+                        break
+
+                    output = res.outputs[0]
+                    if multimodal_processor is not None:
+                        out = multimodal_processor.create_response_chunk(
+                            output, 0, request_id, model_name
+                        )
+                    else:
+                        out = {"token_ids": output.token_ids}
+                    if output.finish_reason:
+                        out["finish_reason"] = output.finish_reason
+                    if output.stop_reason:
+                        out["stop_reason"] = output.stop_reason
+                    out[
+                        "disaggregated_params"
+                    ] = DisaggregatedParamsCodec.encode_to_dict(
+                        output.disaggregated_params
+                    )
+
+                    if res.finished:
+                        if not out.get("finish_reason"):
+                            out["finish_reason"] = "unknown"
+                            logging.warning(
+                                "Request finished with no finish reason set - this indicates a possible bug"
+                            )
+                        self._log_metrics(res)
+
+                    yield out
+
+        except asyncio.CancelledError:
+            # Client cancellation - don't shutdown
+            logging.debug(f"Request {request_id}: Client cancelled")
+            # _cancellation_monitor already called abort_request
+            return  # Just stop, no error response
+
+        except Exception as e:
+            async for out in self._handle_generation_error(e, request_id):
+                yield out
+
+    async def _generate_decode(
+        self,
+        request: dict,
+        context: Context,
+        embeddings: Optional[Union[torch.Tensor, dict]] = None,
+    ):
+        """
+        Stream the generated tokens of a request in aggregated or decode mode.
+
+        Args:
+            request: The request dictionary containing generation parameters
+            context: Context object for cancellation handling
+            embeddings: Optional tensor or dict containing embeddings for multimodal processing
+        """
+        (
+            req,
+            processed_input,
+            sampling_params,
+            disaggregated_params,
+        ) = await self._prepare_generation(request, embeddings)
+        request_id = req.request_id
+        model_name = req.model
+
+        multimodal_processor = self.multimodal_processor
+        publisher = self.publisher
+        coalescing = self._coalescing
+
+        num_output_tokens_so_far = 0
+        last_flush = time.monotonic()
+
+        try:
+            # TODO: Instead of True, we should use streaming from the request.
+            # However, currently dynamo run does not send streaming in the request.
+            generation_result = self.engine.llm.generate_async(
+                inputs=processed_input,
+                sampling_params=sampling_params,
+                disaggregated_params=disaggregated_params,
+                streaming=True,
+            )
+
+            # TRTLLM engine needs to start generating tokens first before stats
+            # can be retrieved, so the publisher is started on the first result.
+            start_publisher = publisher is not None and self.first_generation
+
+            # Use the context manager to handle cancellation monitoring
+            async with self._cancellation_monitor(generation_result, context):
+                async for res in generation_result:
+                    if start_publisher:
+                        publisher.start()
+                        self.first_generation = False
+                        start_publisher = False
 
                     # Upon completion, send a final chunk with "stop" as the finish reason.
                     # This signals to the client that the stream has ended.
-                    if (
-                        res.finished
-                        and self.disaggregation_mode != DisaggregationMode.PREFILL
-                    ):
-                        if self.multimodal_processor:
-                            final_out = self.multimodal_processor.get_stop_response(
-                                request_id, model_name
-                            )
-                            yield final_out
+                    if res.finished and multimodal_processor is not None:
+                        final_out = multimodal_processor.get_stop_response(
+                            request_id, model_name
+                        )
+                        yield final_out
 
                     # If we are not done generating, but there are no outputs, return an error
                     if not res.outputs and not res.finished:
@@ -306,11 +585,27 @@ class HandlerBase:
                         break
 
                     output = res.outputs[0]
+                    # Hold back intermediate chunks while coalescing. The engine returns all
+                    # tokens generated so far, so skipped tokens are part of the next delta.
+                    # The first chunk is always sent right away to keep TTFT unchanged.
+                    if (
+                        coalescing is not None
+                        and num_output_tokens_so_far
+                        and not res.finished
+                        and not output.finish_reason
+                    ):
+                        now = time.monotonic()
+                        if not coalescing.should_flush(
+                            len(output.token_ids) - num_output_tokens_so_far,
+                            now - last_flush,
+                        ):
+                            continue
+                        last_flush = now
+
                     # The engine returns all tokens generated so far. We must calculate the new
                     # tokens generated in this iteration to create the "delta".
-                    next_total_toks = len(output.token_ids)
-                    if self.multimodal_processor:
-                        out = self.multimodal_processor.create_response_chunk(
+                    if multimodal_processor is not None:
+                        out = multimodal_processor.create_response_chunk(
                             output, num_output_tokens_so_far, request_id, model_name
                         )
                     else:
@@ -319,61 +614,25 @@ class HandlerBase:
                         out["finish_reason"] = output.finish_reason
                     if output.stop_reason:
                         out["stop_reason"] = output.stop_reason
-                    if self.disaggregation_mode == DisaggregationMode.PREFILL:
-                        # Return the disaggregated params only when operating in prefill mode.
-                        out["disaggregated_params"] = asdict(
-                            DisaggregatedParamsCodec.encode(output.disaggregated_params)
-                        )
-
-                    if res.finished and not out.get("finish_reason"):
-                        out["finish_reason"] = "unknown"
-                        logging.warning(
-                            "Request finished with no finish reason set - this indicates a possible bug"
-                        )
 
-                    # Log metrics to TensorRT-LLM MetricsCollector when request finishes
-                    if (
-                        res.finished
-                        and self.metrics_collector
-                        and hasattr(res, "metrics_dict")
-                    ):
-                        try:
-                            self.metrics_collector.log_metrics_dict(res.metrics_dict)
-                        except Exception as e:
-                            logging.warning(f"Failed to log TensorRT-LLM metrics: {e}")
+                    if res.finished:
+                        if not out.get("finish_reason"):
+                            out["finish_reason"] = "unknown"
+                            logging.warning(
+                                "Request finished with no finish reason set - this indicates a possible bug"
+                            )
+                        self._log_metrics(res)
 
                     # Yield the chunk to the client and update the token count for the next iteration.
                     yield out
-                    num_output_tokens_so_far = next_total_toks
+                    num_output_tokens_so_far = len(output.token_ids)
 
-        # 1. Client cancellation - don't shutdown
         except asyncio.CancelledError:
+            # Client cancellation - don't shutdown
             logging.debug(f"Request {request_id}: Client cancelled")
             # _cancellation_monitor already called abort_request
             return  # Just stop, no error response
 
-        # 2. Per-request errors - send to client, don't shutdown
-        except RequestError as e:
-            logging.warning(f"Request {request_id} error: {e}")
-            yield {"finish_reason": "error", "token_ids": []}
-
-        # 3. ALL OTHER ERRORS - graceful shutdown
         except Exception as e:
-            error_type = type(e).__name__
-            error_msg = str(e)
-            logging.error(
-                f"Fatal {error_type} in request {request_id}: {error_msg}",
-                exc_info=True,
-            )
-
-            # Try to send error to client before shutdown
-            try:
-                yield {
-                    "finish_reason": "error",
-                    "token_ids": [],
-                }
-            except Exception:
-                pass  # Best effort
-
-            # Initiate graceful shutdown
-            await self._initiate_shutdown(e)
+            async for out in self._handle_generation_error(e, request_id):
+                yield out
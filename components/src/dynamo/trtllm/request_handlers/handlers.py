@@ -64,6 +64,8 @@ class AggregatedHandler(HandlerBase):
     Handler for the aggregated mode.
     """
 
+    __slots__ = ()
+
     def __init__(self, config: RequestHandlerConfig):
         super().__init__(config)
 
@@ -79,6 +81,8 @@ class EncodeHandler(HandlerBase):
     Handler for the encode mode.
     """
 
+    __slots__ = ()
+
     def __init__(self, config: RequestHandlerConfig):
         super().__init__(config)
 
@@ -107,6 +111,8 @@ class PrefillHandler(HandlerBase):
     Handler for the prefill mode.
     """
 
+    __slots__ = ()
+
     def __init__(self, config: RequestHandlerConfig):
         super().__init__(config)
 
@@ -131,8 +137,11 @@ class PrefillHandler(HandlerBase):
 
     async def generate(self, request: dict, context: Context):
         logging.debug(f"New Request ID: {context.id()}")
-        logging.debug(f"PrefillHandler.generate received request: {request}")
+        logging.debug("PrefillHandler.generate received request: %s", request)
         embeddings_tensor = None
+        # Text-only requests are not modified by the local prefill, so the request
+        # is only copied when the multimodal processor will normalize it in place.
+        prefill_request = request
 
         if self.multimodal_processor:
             _, _, embedding_paths = self.multimodal_processor.extract_prompt_and_media(
@@ -145,8 +154,9 @@ class PrefillHandler(HandlerBase):
                         "PrefillHandler calling Encode Worker via remote_encode_with_nixl"
                     )
                     embeddings_tensor = await self.remote_encode_with_nixl(request)
+            prefill_request = copy.deepcopy(request)
+
         # Generate the prefill response locally
-        prefill_request = copy.deepcopy(request)
         prefill_response = None
         response_count = 0
         async for res in self.generate_locally(
@@ -187,6 +197,8 @@ class DecodeHandler(HandlerBase):
     Handler for the decode mode.
     """
 
+    __slots__ = ()
+
     def __init__(self, config: RequestHandlerConfig):
         super().__init__(config)
 
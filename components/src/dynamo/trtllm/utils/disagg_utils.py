@@ -14,6 +14,7 @@
 # limitations under the License.
 
 import base64
+from typing import Optional
 
 from tensorrt_llm.llmapi import DisaggregatedParams
 
@@ -44,21 +45,27 @@ class DisaggregatedParamsCodec:
         )
 
     @staticmethod
-    def encode(
+    def encode_to_dict(
         disaggregated_params: DisaggregatedParams,
-    ) -> DisaggregatedParams:
+    ) -> Optional[dict]:
+        """
+        Encode disaggregated params into a plain dict for network transfer.
+
+        The opaque state is base64 encoded; `decode` reverses this once the dict
+        has been turned back into DisaggregatedParams.
+        """
         if disaggregated_params is None:
             return None
 
-        encoded_opaque_state = (
-            base64.b64encode(disaggregated_params.opaque_state).decode("utf-8")
-            if disaggregated_params.opaque_state is not None
-            else None
-        )
-        return DisaggregatedParams(
-            request_type=disaggregated_params.request_type,
-            first_gen_tokens=disaggregated_params.first_gen_tokens,
-            ctx_request_id=disaggregated_params.ctx_request_id,
-            opaque_state=encoded_opaque_state,
-            draft_tokens=disaggregated_params.draft_tokens,
-        )
+        opaque_state = disaggregated_params.opaque_state
+        return {
+            "request_type": disaggregated_params.request_type,
+            "first_gen_tokens": disaggregated_params.first_gen_tokens,
+            "ctx_request_id": disaggregated_params.ctx_request_id,
+            "opaque_state": (
+                base64.b64encode(opaque_state).decode("utf-8")
+                if opaque_state is not None
+                else None
+            ),
+            "draft_tokens": disaggregated_params.draft_tokens,
+        }
@@ -33,33 +33,43 @@ from dynamo.planner.utils.exceptions import (
     SubComponentNotFoundError,
 )
 
+_SYNC_KUBE_API_METHODS = ("get_graph_deployment", "is_deployment_ready")
+_ASYNC_KUBE_API_METHODS = ("update_graph_replicas", "wait_for_graph_deployment_ready")
 
-@pytest.fixture
-def mock_kube_api():
+
+@pytest.fixture(scope="module")
+def module_kube_api():
     mock_api = Mock()
-    mock_api.get_graph_deployment = Mock()
-    mock_api.update_graph_replicas = AsyncMock()
-    mock_api.wait_for_graph_deployment_ready = AsyncMock()
-    mock_api.is_deployment_ready = Mock()
+    for name in _SYNC_KUBE_API_METHODS:
+        setattr(mock_api, name, Mock())
+    for name in _ASYNC_KUBE_API_METHODS:
+        setattr(mock_api, name, AsyncMock())
     return mock_api
 
 
+@pytest.fixture(scope="module")
+def module_kubernetes_connector(module_kube_api):
+    # Patch the KubernetesAPI class once for all tests in this module
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(
+            "dynamo.planner.kubernetes_connector.KubernetesAPI",
+            Mock(return_value=module_kube_api),
+        )
+        with patch.dict(os.environ, {"DYN_PARENT_DGD_K8S_NAME": "test-graph"}):
+            connector = KubernetesConnector("test-dynamo-namespace")
+        yield connector
+
+
 @pytest.fixture
-def mock_kube_api_class(mock_kube_api):
-    mock_class = Mock()
-    mock_class.return_value = mock_kube_api
-    return mock_class
+def mock_kube_api(module_kube_api):
+    # Drop calls, return values and side effects left behind by previous tests
+    module_kube_api.reset_mock(return_value=True, side_effect=True)
+    return module_kube_api
 
 
 @pytest.fixture
-def kubernetes_connector(mock_kube_api_class, monkeypatch):
-    # Patch the KubernetesAPI class before instantiating the connector
-    monkeypatch.setattr(
-        "dynamo.planner.kubernetes_connector.KubernetesAPI", mock_kube_api_class
-    )
-    with patch.dict(os.environ, {"DYN_PARENT_DGD_K8S_NAME": "test-graph"}):
-        connector = KubernetesConnector("test-dynamo-namespace")
-        return connector
+def kubernetes_connector(module_kubernetes_connector, mock_kube_api):
+    return module_kubernetes_connector
 
 
 def test_kubernetes_connector_no_env_var():
@@ -0,0 +1,240 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the SGLang LLM request handlers."""
+
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+
+from dynamo.sglang.args import DisaggregationMode
+from dynamo.sglang.request_handlers.llm import DecodeWorkerHandler, PrefillWorkerHandler
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.sglang,
+    pytest.mark.gpu_1,
+]
+
+SGLANG_REQUEST_ID = "sglang-request-id"
+TEXT = "Hello, world!"
+NUM_TOKENS = 10
+
+
+def _meta_info(finished: bool) -> dict:
+    return {
+        "id": SGLANG_REQUEST_ID,
+        "finish_reason": {"type": "stop"} if finished else None,
+    }
+
+
+def _token_responses(num_tokens: int) -> list:
+    """Build engine responses that carry all token IDs generated so far."""
+    return [
+        {"output_ids": list(range(step)), "meta_info": _meta_info(step == num_tokens)}
+        for step in range(1, num_tokens + 1)
+    ]
+
+
+def _text_responses(text: str) -> list:
+    """Build engine responses that carry all text generated so far."""
+    return [
+        {"text": text[:end], "meta_info": _meta_info(end == len(text))}
+        for end in range(1, len(text) + 1)
+    ]
+
+
+async def _stream(responses):
+    for res in responses:
+        yield res
+
+
+def _make_context(stopped: bool = False):
+    context = Mock()
+    context.is_stopped.return_value = stopped
+    return context
+
+
+def _record_monitor(handler) -> list:
+    """Replace the cancellation monitor and record the request IDs it sees."""
+    entered = []
+
+    @asynccontextmanager
+    async def _monitor(sglang_request_id, context):
+        entered.append(sglang_request_id)
+        yield None
+
+    handler._cancellation_monitor = _monitor
+    return entered
+
+
+def _make_decode_handler(skip_tokenizer_init: bool = True):
+    config = Mock()
+    config.serving_mode = DisaggregationMode.AGGREGATED
+    config.server_args = SimpleNamespace(
+        skip_tokenizer_init=skip_tokenizer_init, served_model_name="test-model"
+    )
+    return DecodeWorkerHandler(Mock(), Mock(), config, None)
+
+
+async def _collect(stream):
+    return [chunk async for chunk in stream]
+
+
+@pytest.mark.parametrize(
+    "skip_tokenizer_init,process_stream",
+    [(True, "_process_token_stream"), (False, "_process_text_stream")],
+)
+def test_stream_processor_follows_skip_tokenizer_init(
+    skip_tokenizer_init, process_stream
+):
+    handler = _make_decode_handler(skip_tokenizer_init)
+
+    assert handler._process_stream == getattr(handler, process_stream)
+
+
+@pytest.mark.parametrize(
+    "process_stream", ["_process_token_stream", "_process_text_stream"]
+)
+async def test_empty_stream_yields_nothing(process_stream):
+    handler = _make_decode_handler()
+    entered = _record_monitor(handler)
+
+    chunks = await _collect(
+        getattr(handler, process_stream)(_stream([]), _make_context())
+    )
+
+    assert chunks == []
+    assert entered == []
+
+
+@pytest.mark.parametrize(
+    "process_stream,responses",
+    [
+        ("_process_token_stream", _token_responses(3)),
+        ("_process_text_stream", _text_responses(TEXT)),
+    ],
+)
+async def test_monitor_entered_once_with_first_response_id(process_stream, responses):
+    """The cancellation monitor is started once, not per response."""
+    handler = _make_decode_handler()
+    entered = _record_monitor(handler)
+
+    await _collect(
+        getattr(handler, process_stream)(_stream(responses), _make_context())
+    )
+
+    assert entered == [SGLANG_REQUEST_ID]
+
+
+@pytest.mark.parametrize("stopped", [True, False])
+async def test_empty_final_response_errors_only_when_not_stopped(stopped):
+    """An aborted request ends without output, which is not an error if stopped."""
+    handler = _make_decode_handler()
+    _record_monitor(handler)
+    responses = [
+        {"output_ids": [0], "meta_info": _meta_info(False)},
+        {"output_ids": [], "meta_info": _meta_info(False)},
+    ]
+
+    chunks = await _collect(
+        handler._process_token_stream(_stream(responses), _make_context(stopped))
+    )
+
+    assert chunks[0] == {"token_ids": [0]}
+    if stopped:
+        assert chunks == [{"token_ids": [0]}]
+    else:
+        assert chunks[1:] == [{"finish_reason": "error", "token_ids": []}]
+
+
+async def test_text_deltas_join_to_full_text():
+    handler = _make_decode_handler(skip_tokenizer_init=False)
+    _record_monitor(handler)
+
+    chunks = await _collect(
+        handler._process_text_stream(_stream(_text_responses(TEXT)), _make_context())
+    )
+
+    assert "".join(chunk["choices"][0]["delta"]["content"] for chunk in chunks) == TEXT
+    assert all(chunk["id"] == SGLANG_REQUEST_ID for chunk in chunks)
+    assert chunks[-1]["choices"][0]["finish_reason"] == "stop"
+    assert all(chunk["choices"][0]["finish_reason"] is None for chunk in chunks[:-1])
+
+
+@pytest.mark.parametrize("num_responses", [0, 3])
+async def test_prefill_consumes_all_results(num_responses):
+    """Prefill drains the stream under a monitor keyed by the first response."""
+    handler = PrefillWorkerHandler.__new__(PrefillWorkerHandler)
+    entered = _record_monitor(handler)
+    consumed = []
+
+    async def _results():
+        for res in _token_responses(num_responses):
+            consumed.append(res)
+            yield res
+
+    await handler._consume_results(_results(), _make_context())
+
+    assert len(consumed) == num_responses
+    assert entered == ([SGLANG_REQUEST_ID] if num_responses else [])
+
+
+def _make_coalescing_handler(monkeypatch, coalesce_n=None):
+    if coalesce_n is None:
+        monkeypatch.delenv("DYNAMO_STREAM_COALESCE_N", raising=False)
+    else:
+        monkeypatch.setenv("DYNAMO_STREAM_COALESCE_N", str(coalesce_n))
+    monkeypatch.delenv("DYNAMO_STREAM_COALESCE_US", raising=False)
+    # Coalescing is read from the environment when the handler is created.
+    handler = _make_decode_handler()
+    _record_monitor(handler)
+    return handler
+
+
+async def _collect_token_chunks(handler):
+    return await _collect(
+        handler._process_token_stream(
+            _stream(_token_responses(NUM_TOKENS)), _make_context()
+        )
+    )
+
+
+@pytest.mark.parametrize("coalesce_n", [None, 0, 1])
+async def test_stream_unchanged_without_coalescing(monkeypatch, coalesce_n):
+    """N unset, 0 or 1 yields one chunk per engine step."""
+    handler = _make_coalescing_handler(monkeypatch, coalesce_n)
+    chunks = await _collect_token_chunks(handler)
+
+    assert [chunk["token_ids"] for chunk in chunks] == [
+        [token] for token in range(NUM_TOKENS)
+    ]
+    assert chunks[-1]["finish_reason"] == "stop"
+
+
+async def test_coalescing_preserves_tokens(monkeypatch):
+    """Coalesced deltas join up to the full output."""
+    handler = _make_coalescing_handler(monkeypatch, coalesce_n=4)
+    chunks = await _collect_token_chunks(handler)
+
+    assert [token for chunk in chunks for token in chunk["token_ids"]] == list(
+        range(NUM_TOKENS)
+    )
+    assert len(chunks) < NUM_TOKENS
+
+
+async def test_coalescing_sends_first_and_final_chunks_immediately(monkeypatch):
+    """The first chunk is not held back, and the finishing chunk is flushed."""
+    handler = _make_coalescing_handler(monkeypatch, coalesce_n=4)
+    chunks = await _collect_token_chunks(handler)
+
+    assert [chunk["token_ids"] for chunk in chunks] == [
+        [0],
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9],
+    ]
+    assert chunks[-1]["finish_reason"] == "stop"
+    assert all("finish_reason" not in chunk for chunk in chunks[:-1])
@@ -0,0 +1,61 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for stream coalescing utilities."""
+
+import math
+import sys
+
+import pytest
+
+from dynamo.common.utils.stream_coalescing import (
+    COALESCE_TOKENS_ENV,
+    COALESCE_US_ENV,
+    StreamCoalescing,
+    stream_coalescing_from_env,
+)
+
+pytestmark = [
+    pytest.mark.unit,
+]
+
+
+@pytest.fixture
+def coalesce_env(monkeypatch):
+    """Set the coalescing env vars, clearing any that are passed as None."""
+
+    def _set(tokens=None, micros=None):
+        for name, value in ((COALESCE_TOKENS_ENV, tokens), (COALESCE_US_ENV, micros)):
+            if value is None:
+                monkeypatch.delenv(name, raising=False)
+            else:
+                monkeypatch.setenv(name, str(value))
+
+    return _set
+
+
+@pytest.mark.parametrize(
+    "tokens,micros",
+    [(None, None), (0, None), (1, None), (None, 0), (1, 0)],
+)
+def test_disabled_by_default(coalesce_env, tokens, micros):
+    coalesce_env(tokens, micros)
+    assert stream_coalescing_from_env() is None
+
+
+def test_token_limit_only(coalesce_env):
+    coalesce_env(tokens=4)
+    coalescing = stream_coalescing_from_env()
+
+    assert coalescing == StreamCoalescing(max_tokens=4, max_seconds=math.inf)
+    assert not coalescing.should_flush(3, 1e9)
+    assert coalescing.should_flush(4, 0.0)
+
+
+def test_time_limit_only(coalesce_env):
+    coalesce_env(micros=2000)
+    coalescing = stream_coalescing_from_env()
+
+    assert coalescing == StreamCoalescing(max_tokens=sys.maxsize, max_seconds=0.002)
+    assert not coalescing.should_flush(1000, 0.001)
+    assert coalescing.should_flush(1, 0.002)
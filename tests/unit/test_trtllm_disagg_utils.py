@@ -0,0 +1,49 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the TRTLLM disaggregated params codec."""
+
+import pytest
+from tensorrt_llm.llmapi import DisaggregatedParams
+
+from dynamo.trtllm.utils.disagg_utils import DisaggregatedParamsCodec
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.trtllm_marker,
+    pytest.mark.gpu_1,
+]
+
+CODEC_FIELDS = (
+    "request_type",
+    "first_gen_tokens",
+    "ctx_request_id",
+    "opaque_state",
+    "draft_tokens",
+)
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        DisaggregatedParams(
+            request_type="context_only",
+            first_gen_tokens=[42],
+            ctx_request_id=7,
+            opaque_state=b"\x00\x01opaque\xff",
+            draft_tokens=[1, 2, 3],
+        ),
+        DisaggregatedParams(request_type="context_only", opaque_state=None),
+    ],
+)
+def test_encode_to_dict_round_trip(params):
+    """Encoding to a dict and decoding restores the original fields."""
+    encoded = DisaggregatedParamsCodec.encode_to_dict(params)
+    decoded = DisaggregatedParamsCodec.decode(DisaggregatedParams(**encoded))
+
+    for name in CODEC_FIELDS:
+        assert getattr(decoded, name) == getattr(params, name)
+
+
+def test_encode_to_dict_none():
+    assert DisaggregatedParamsCodec.encode_to_dict(None) is None
@@ -0,0 +1,202 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+
+"""Unit tests for the TRTLLM request handler base."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import pytest
+from tensorrt_llm.llmapi.llm import SamplingParams
+
+from dynamo.trtllm.request_handlers.handler_base import (
+    DisaggregationMode,
+    DisaggregationStrategy,
+    HandlerBase,
+    RequestHandlerConfig,
+)
+
+pytestmark = [
+    pytest.mark.unit,
+    pytest.mark.trtllm_marker,
+    pytest.mark.gpu_1,
+]
+
+NUM_TOKENS = 10
+
+
+def _make_results(num_tokens: int):
+    """Build engine results that carry all tokens generated so far."""
+    results = []
+    for step in range(1, num_tokens + 1):
+        finished = step == num_tokens
+        output = SimpleNamespace(
+            token_ids=list(range(step)),
+            finish_reason="stop" if finished else None,
+            stop_reason=None,
+        )
+        results.append(SimpleNamespace(finished=finished, outputs=[output]))
+    return results
+
+
+class _FakeGenerationResult:
+    def __init__(self, results):
+        self._results = results
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for res in self._results:
+            yield res
+
+    def abort(self):
+        pass
+
+
+def _make_handler(monkeypatch, coalesce_n=None, default_sampling_params=None):
+    if coalesce_n is None:
+        monkeypatch.delenv("DYNAMO_STREAM_COALESCE_N", raising=False)
+    else:
+        monkeypatch.setenv("DYNAMO_STREAM_COALESCE_N", str(coalesce_n))
+    monkeypatch.delenv("DYNAMO_STREAM_COALESCE_US", raising=False)
+    monkeypatch.delenv("DYNAMO_ENABLE_TEST_LOGITS_PROCESSOR", raising=False)
+
+    engine = Mock()
+    engine.llm.generate_async.side_effect = lambda **kwargs: _FakeGenerationResult(
+        _make_results(NUM_TOKENS)
+    )
+    config = RequestHandlerConfig(
+        component=Mock(),
+        engine=engine,
+        default_sampling_params=default_sampling_params or SamplingParams(),
+        publisher=None,
+        disaggregation_mode=DisaggregationMode.AGGREGATED,
+        disaggregation_strategy=DisaggregationStrategy.DECODE_FIRST,
+        next_client=None,
+    )
+    return HandlerBase(config)
+
+
+def _make_request(sampling_options=None):
+    return {
+        "token_ids": [1, 2, 3],
+        "sampling_options": sampling_options or {},
+        "stop_conditions": {"max_tokens": NUM_TOKENS},
+        "id": "test-request",
+    }
+
+
+async def _collect_chunks(handler):
+    context = Mock()
+    # Never signal cancellation; the monitor task is cancelled on completion.
+    context.async_killed_or_stopped = asyncio.Event().wait
+    request = _make_request()
+    return [chunk async for chunk in handler._generate_decode(request, context)]
+
+
+def _joined_tokens(chunks):
+    return [token for chunk in chunks for token in chunk["token_ids"]]
+
+
+@pytest.mark.parametrize("coalesce_n", [None, 0, 1])
+async def test_stream_unchanged_without_coalescing(monkeypatch, coalesce_n):
+    """N unset, 0 or 1 yields one chunk per engine step."""
+    handler = _make_handler(monkeypatch, coalesce_n)
+    chunks = await _collect_chunks(handler)
+
+    assert [chunk["token_ids"] for chunk in chunks] == [
+        [token] for token in range(NUM_TOKENS)
+    ]
+    assert chunks[-1]["finish_reason"] == "stop"
+
+
+async def test_coalescing_preserves_tokens(monkeypatch):
+    """Coalesced deltas join up to the full output."""
+    handler = _make_handler(monkeypatch, coalesce_n=4)
+    chunks = await _collect_chunks(handler)
+
+    assert _joined_tokens(chunks) == list(range(NUM_TOKENS))
+    assert len(chunks) < NUM_TOKENS
+
+
+async def test_coalescing_sends_first_and_final_chunks_immediately(monkeypatch):
+    """The first chunk is not held back, and the finishing chunk is flushed."""
+    handler = _make_handler(monkeypatch, coalesce_n=4)
+    chunks = await _collect_chunks(handler)
+
+    assert chunks[0]["token_ids"] == [0]
+    assert [chunk["token_ids"] for chunk in chunks[1:]] == [
+        [1, 2, 3, 4],
+        [5, 6, 7, 8],
+        [9],
+    ]
+    assert chunks[-1]["finish_reason"] == "stop"
+    assert all("finish_reason" not in chunk for chunk in chunks[:-1])
+
+
+def _setup_default_sampling_params():
+    """Default params carrying the state SamplingParams._setup(tokenizer) derives."""
+    params = SamplingParams(end_id=2, pad_id=0, stop_token_ids=[5, 6])
+    params._stop_word_ids = [[7, 8], [9]]
+    return params
+
+
+async def test_setup_state_reaches_every_request(monkeypatch):
+    """Tokenizer-derived defaults are applied to each request's params."""
+    handler = _make_handler(
+        monkeypatch, default_sampling_params=_setup_default_sampling_params()
+    )
+
+    for _ in range(2):
+        _, _, sampling_params, _ = await handler._prepare_generation(_make_request())
+        assert sampling_params.end_id == 2
+        assert sampling_params.pad_id == 0
+        assert sampling_params._stop_word_ids == ((7, 8), (9,))
+        assert sampling_params.max_tokens == NUM_TOKENS
+
+
+async def test_request_params_do_not_leak_into_defaults(monkeypatch):
+    """Changing one request's params leaves the shared snapshot untouched."""
+    handler = _make_handler(
+        monkeypatch, default_sampling_params=_setup_default_sampling_params()
+    )
+    default_fields = dict(handler._default_sp_fields)
+    default_state = dict(handler._default_sp_state)
+
+    _, _, first, _ = await handler._prepare_generation(_make_request())
+    # Shared containers are immutable, so they cannot be changed in place.
+    with pytest.raises(AttributeError):
+        first.stop_token_ids.append(99)
+    with pytest.raises(AttributeError):
+        first._stop_word_ids[0].append(99)
+    first.stop_token_ids = [99]
+    first._stop_word_ids = [[99]]
+    first.end_id = 99
+
+    assert handler._default_sp_fields == default_fields
+    assert handler._default_sp_state == default_state
+
+    _, _, second, _ = await handler._prepare_generation(_make_request())
+    assert second.stop_token_ids == (5, 6)
+    assert second._stop_word_ids == ((7, 8), (9,))
+    assert second.end_id == 2
+
+
+async def test_sampling_options_override_defaults(monkeypatch):
+    """Only set options that are SamplingParams fields override the defaults."""
+    handler = _make_handler(
+        monkeypatch,
+        default_sampling_params=SamplingParams(temperature=1.0, top_k=3, top_p=0.9),
+    )
+    request = _make_request(
+        {"temperature": 0.5, "top_k": 0, "top_p": None, "not_a_field": 1}
+    )
+
+    _, _, sampling_params, _ = await handler._prepare_generation(request)
+
+    assert sampling_params.temperature == 0.5
+    assert sampling_params.top_k == 3
+    assert sampling_params.top_p == 0.9
+    assert not hasattr(sampling_params, "not_a_field")